@@ -8,73 +8,25 @@ import json
 import os
 from pathlib import Path
 
-from anki.collection import Collection
-from rich.console import Console
-from rich.syntax import Syntax
-
-from util.furigana import furigana_to_kanji, furigana_to_kana
-from util.mora import mora_len, mora_substr
+from util.accent import (
+    build_accent_trie,
+    make_accent_spans,
+    segment_accents,
+)
 
 DEFAULT_ACCENTS_FILE = Path(__file__).parent / "accents.json"
 DEFAULT_DB_LOCATION = "~/.local/share/Anki2/Jim/collection.anki2"
 
-console = Console(highlight=False)
-
 
 @dataclass
 class Stats:
     same: int = 0
     different: int = 0
     unknown: int = 0
+    candidates: int = 0
     update: int = 0
 
 
-def get_accent_pos(accent_data: dict, kanji: str, kana: str) -> int | None:
-    if kanji != kana:
-        # kanji with furigana; only look up readings specific to that kanji
-        kanji_accents = accent_data.get(kanji)
-        if kanji_accents:
-            return kanji_accents.get(kana)
-    else:
-        # just kana
-        return accent_data.get(kana)
-
-
-def make_span(css_class: str, content: str) -> str:
-    return f'<span class="{css_class}">{content}</span>'
-
-
-def make_accent_span(accent_data: dict, furigana: str) -> str | None:
-    kanji = furigana_to_kanji(furigana)
-    kana = furigana_to_kana(furigana)
-    if not kana:
-        return None
-
-    accent_pos = get_accent_pos(accent_data, kanji, kana)
-    if accent_pos is None:
-        return None
-
-    num_morae = mora_len(kana)
-    if accent_pos == 0:
-        # heiban (LHHHHH)
-        span = make_span("l-h" if num_morae > 1 else "h", mora_substr(kana, 0, 1))
-        if num_morae > 1:
-            span += make_span("h", mora_substr(kana, 1))
-    elif accent_pos == 1:
-        # atamadaka (HLLLLL)
-        span = make_span("h-l", mora_substr(kana, 0, 1))
-        if num_morae > 1:
-            span += make_span("l", mora_substr(kana, 1))
-    else:
-        # nakadaka (LHHHHL) or odaka (LHHHH)
-        span = make_span("l-h", mora_substr(kana, 0, 1))
-        span += make_span("h-l", mora_substr(kana, 1, accent_pos))
-        if accent_pos < num_morae:
-            span += make_span("l", mora_substr(kana, accent_pos))
-
-    return span
-
-
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description=__doc__,
@@ -104,20 +56,43 @@ if __name__ == "__main__":
     )
     args = parser.parse_args()
 
+    # deferred until after argument parsing, since these are slow to import
+    from anki.collection import Collection
+    from rich.console import Console
+
+    console = Console(highlight=False)
+
     with open(args.accents_file) as accents_fh:
         accent_data = json.load(accents_fh)
 
     col = Collection(args.anki_collection)
+    notes = [
+        col.get_note(note_id)
+        for note_id in sorted(col.find_notes('"note:Japanese vocab"'))
+    ]
+    new_accents = make_accent_spans(accent_data, [note["Japanese"] for note in notes])
+
     stats = Stats()
     updates = []
-    for note_id in sorted(col.find_notes('"note:Japanese vocab"')):
-        note = col.get_note(note_id)
+    # only needed for unknown words, so built on first use
+    accent_trie = None
+    for note, new_accent in zip(notes, new_accents):
         jp = note["Japanese"]
-        new_accent = make_accent_span(accent_data, jp)
         if not new_accent:
             stats.unknown += 1
+            if accent_trie is None:
+                accent_trie = build_accent_trie(accent_data)
+            segments = segment_accents(accent_trie, jp)
+            if segments:
+                stats.candidates += 1
             if args.verbose:
-                console.print(f"[yellow]unknown[/]: {jp!r}")
+                if segments:
+                    console.print(
+                        f"[yellow]unknown[/]: {jp!r}, candidates: "
+                        + " + ".join(str(segment) for segment in segments)
+                    )
+                else:
+                    console.print(f"[yellow]unknown[/]: {jp!r}")
             continue
 
         current_accent = note["Pitch accent"]
@@ -147,6 +122,7 @@ if __name__ == "__main__":
     print()
     print(f"same:      {stats.same}")
     print(f"unknown:   {stats.unknown}")
+    print(f"  (with candidates: {stats.candidates})")
     print(f"different: {stats.different}")
     print(f"to update: {stats.update}")
 
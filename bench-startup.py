@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Measure how long each script takes to start up, by timing `--help`.
+
+The bare interpreter and the heavy third-party imports are timed as well for
+comparison; a script's `--help` should cost about as much as the interpreter
+alone, not as much as importing anki.
+"""
+
+import argparse
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import time
+
+SCRIPT_DIR = Path(__file__).parent
+
+SCRIPTS = [
+    "validate.py",
+    "add-pitch-accents.py",
+    "make-bold-examples.py",
+    "find-missing-examples.py",
+    "kanji-index.py",
+    "parse-pitch-accents.py",
+]
+
+BASELINES = {
+    "python": "pass",
+    "import rich": "import rich.console",
+    "import anki": "import anki.collection",
+}
+
+
+def time_command(command: list[str], repeat: int) -> list[float] | None:
+    """Return the wall-clock times of `repeat` runs of `command`, or None if it
+    fails."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(
+            command,
+            cwd=SCRIPT_DIR,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        times.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            return None
+    return times
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "-n",
+        "--repeat",
+        type=int,
+        default=10,
+        help="number of times to run each command",
+    )
+    args = parser.parse_args()
+
+    commands = {name: ["-c", code] for name, code in BASELINES.items()}
+    commands.update({script: [script, "--help"] for script in SCRIPTS})
+
+    print(f"{'command':<26} {'min':>8} {'median':>8}")
+    for name, command in commands.items():
+        times = time_command([sys.executable] + command, args.repeat)
+        if times is None:
+            print(f"{name:<26} {'failed':>8}")
+            continue
+        print(
+            f"{name:<26} {min(times) * 1000:>6.1f}ms"
+            f" {statistics.median(times) * 1000:>6.1f}ms"
+        )
@@ -1,25 +1,38 @@
 #!/usr/bin/env python3
 """Display any Kanji examples that don't have a corresponding Vocabulary entry."""
 
+import argparse
 from collections import namedtuple
 from datetime import datetime, timedelta
 import os
-import re
 import sys
 
-from anki.collection import Collection
-from rich import box
-from rich.console import Console
-from rich.table import Table
+from util.furigana import clean_example
 
-DB_LOCATION = "~/.local/share/Anki2/Jim/collection.anki2"
+DEFAULT_DB_LOCATION = "~/.local/share/Anki2/Jim/collection.anki2"
 
 Example = namedtuple("Example", ["note_id", "example_id", "jp", "en", "date"])
 
 
 if __name__ == "__main__":
-    db_file = os.path.expanduser(DB_LOCATION)
-    col = Collection(db_file)
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--anki-collection",
+        default=os.path.expanduser(DEFAULT_DB_LOCATION),
+        help="Anki collection sqlite file",
+    )
+    args = parser.parse_args()
+
+    # deferred until after argument parsing, since these are slow to import
+    from anki.collection import Collection
+    from rich import box
+    from rich.console import Console
+    from rich.table import Table
+
+    col = Collection(args.anki_collection)
 
     examples = []
     suffixes = ("]な", "]する")
@@ -40,9 +53,7 @@ if __name__ == "__main__":
             continue
 
         for n in range(len(jp_examples)):
-            jp = jp_examples[n].strip()
-            jp = jp.replace("*", "")
-            jp = re.sub(r"\](な|する)$", "]", jp)
+            jp = clean_example(jp_examples[n])
             examples.append(
                 Example(
                     jp=jp,
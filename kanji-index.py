@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Maintain and query an index of which notes use each kanji.
+
+`update` refreshes the index from the Anki collection, reloading only notes
+that changed since the last run.  The other commands answer from the saved
+index alone, without opening the collection.
+"""
+
+import argparse
+import os
+from pathlib import Path
+import sys
+
+from util.kanji_index import KanjiIndex
+
+DEFAULT_INDEX_FILE = Path(__file__).parent / "kanji-index.json"
+DEFAULT_DB_LOCATION = "~/.local/share/Anki2/Jim/collection.anki2"
+
+
+def update(args: argparse.Namespace, index: KanjiIndex) -> None:
+    # the other commands don't need anki at all, so don't pay for importing it
+    from anki.collection import Collection
+
+    col = Collection(args.anki_collection)
+    stats = index.update(col)
+    index.save(args.index_file)
+
+    print(f"added:     {stats.added}")
+    print(f"changed:   {stats.changed}")
+    print(f"removed:   {stats.removed}")
+    print(f"unchanged: {stats.unchanged}")
+
+
+def lookup(args: argparse.Namespace, index: KanjiIndex) -> None:
+    for kanji in "".join(args.kanji):
+        vocab_ids, example_ids = index.lookup(kanji)
+        print(f"{kanji}: {len(vocab_ids)} vocab, {len(example_ids)} examples")
+        for note_id in vocab_ids:
+            print(f"\tvocab:   {index.notes[note_id].key}")
+        for note_id, example_id in example_ids:
+            note = index.notes[note_id]
+            print(
+                f"\texample: {note.examples[example_id - 1]}"
+                f" ({note.key} #{example_id})"
+            )
+
+
+def no_vocab(args: argparse.Namespace, index: KanjiIndex) -> None:
+    missing = index.without_vocab()
+    for kanji, note_id in missing:
+        examples = len(index.notes[note_id].examples)
+        print(f"{kanji}\t{examples} examples")
+    print(f"\n{len(missing)} Kanji notes without vocab")
+
+
+def no_kanji_note(args: argparse.Namespace, index: KanjiIndex) -> None:
+    missing = index.without_kanji_note()
+    for kanji, count in missing:
+        print(f"{kanji}\t{count} vocab")
+    print(f"\n{len(missing)} kanji in vocab without a Kanji note")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--index-file",
+        default=DEFAULT_INDEX_FILE,
+        help="kanji index data file",
+    )
+    parser.add_argument(
+        "--anki-collection",
+        default=os.path.expanduser(DEFAULT_DB_LOCATION),
+        help="Anki collection sqlite file, for updating the index",
+    )
+    subparsers = parser.add_subparsers(required=True)
+
+    update_parser = subparsers.add_parser(
+        "update", help="refresh the index from the Anki collection"
+    )
+    update_parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="discard the existing index and rebuild it from scratch",
+    )
+    update_parser.set_defaults(func=update)
+
+    lookup_parser = subparsers.add_parser(
+        "lookup", help="list the vocab and examples using each kanji"
+    )
+    lookup_parser.add_argument("kanji", nargs="+", help="kanji to look up")
+    lookup_parser.set_defaults(func=lookup)
+
+    subparsers.add_parser(
+        "no-vocab", help="list Kanji notes not used by any vocab"
+    ).set_defaults(func=no_vocab)
+
+    subparsers.add_parser(
+        "no-kanji-note", help="list kanji used in vocab which lack a Kanji note"
+    ).set_defaults(func=no_kanji_note)
+
+    args = parser.parse_args()
+
+    if args.func is update and args.rebuild:
+        index = KanjiIndex()
+    else:
+        index = KanjiIndex.load(args.index_file)
+        if not index.notes and args.func is not update:
+            print(
+                f"index {args.index_file} is empty; run '{parser.prog} update' first",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+
+    args.func(args, index)
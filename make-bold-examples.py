@@ -6,25 +6,11 @@ from dataclasses import dataclass
 import os
 import re
 
-from anki.collection import Collection
-from rich.console import Console
-from rich.highlighter import RegexHighlighter
-from rich.theme import Theme
-import rich.markup
-
 from util.furigana import furigana_to_kana
 
 DEFAULT_DB_LOCATION = "~/.local/share/Anki2/Jim/collection.anki2"
 
 
-class BoldHighlighter(RegexHighlighter):
-    highlights = [r"(?P<bold><b>.*?</b>)"]
-
-
-theme = Theme({"bold": "yellow"})
-console = Console(highlighter=BoldHighlighter(), theme=theme)
-
-
 @dataclass
 class Stats:
     count: int = 0
@@ -34,6 +20,19 @@ class Stats:
     update: int = 0
 
 
+def make_console():
+    # deferred until after argument parsing, since these are slow to import
+    from rich.console import Console
+    from rich.highlighter import RegexHighlighter
+    from rich.theme import Theme
+
+    class BoldHighlighter(RegexHighlighter):
+        highlights = [r"(?P<bold><b>.*?</b>)"]
+
+    theme = Theme({"bold": "yellow"})
+    return Console(highlighter=BoldHighlighter(), theme=theme)
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description=__doc__,
@@ -59,6 +58,10 @@ if __name__ == "__main__":
     )
     args = parser.parse_args()
 
+    # deferred until after argument parsing, since it's slow to import
+    from anki.collection import Collection
+
+    console = make_console()
     col = Collection(args.anki_collection)
     stats = Stats()
     updates = []
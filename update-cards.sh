@@ -1,13 +1,59 @@
 #!/bin/bash
 # Check and update cards after adding/modifying them
+#
+# Does nothing if neither the notes in the collection nor these scripts have
+# changed since the last successful run against that collection, unless -f is
+# given.
 set -eu
 
 dir=$(dirname "$0")
+collection=${ANKI_COLLECTION:-~/.local/share/Anki2/Jim/collection.anki2}
+# one stamp per collection, so switching collections doesn't skip a run
+stamp="$dir/.update-cards.$(printf %s "$collection" | cksum | cut -d' ' -f1).stamp"
+
+# print the note count and latest note modification time, which change whenever
+# a note is added, edited or deleted but not when cards are reviewed; this uses
+# the system python since only the stdlib is needed, and prints nothing if the
+# collection can't be read
+notes_state () {
+    python3 - "$collection" <<'EOF' 2>/dev/null || true
+import sqlite3
+import sys
+from urllib.parse import quote
+
+db = sqlite3.connect(f"file:{quote(sys.argv[1])}?mode=ro", uri=True)
+print(*db.execute("select count(), max(mod) from notes").fetchone())
+EOF
+}
+
+force=
+if [ "${1:-}" = "-f" ]; then
+    force=1
+fi
+
+if [ -z "$force" ] && [ -e "$stamp" ]; then
+    state=$(notes_state)
+    if [ -n "$state" ] && [ "$state" = "$(cat "$stamp")" ] && [ -z "$(
+        find "$dir"/*.py "$dir"/util/*.py "$dir/accents.json" \
+            "$dir/update-cards.sh" "$dir/poetry.lock" -newer "$stamp" 2>/dev/null
+    )" ]; then
+        echo "no changes since last run; use -f to run anyway"
+        exit 0
+    fi
+fi
+
+# created before running anything, so that changes made to the scripts while
+# this is running aren't treated as already seen next time
+new_stamp=$(mktemp "$stamp.XXXXXX")
+trap 'rm -f "$new_stamp" "$new_stamp.state"' EXIT
+
+# resolve the virtualenv once rather than starting poetry for every script
+python=$(poetry env info -C "$dir" --executable)
 
 run () {
     script=$1
     shift
-    (set -x; poetry run -C "$dir" "$dir/$script" "$@")
+    (set -x; "$python" "$dir/$script" --anki-collection "$collection" "$@")
 }
 
 
@@ -15,3 +61,10 @@ run validate.py
 run add-pitch-accents.py
 run make-bold-examples.py
 run find-missing-examples.py
+run kanji-index.py update
+
+# recorded after the run so the scripts' own note updates count as seen, but
+# keeping the mtime from before the run for the script check above
+notes_state > "$new_stamp.state"
+touch -r "$new_stamp" "$new_stamp.state"
+mv "$new_stamp.state" "$stamp"
@@ -0,0 +1,139 @@
+"""Looking up pitch-accent information and rendering it as HTML spans.
+
+The rendered span depends only on the kana reading and the accent position, so
+`make_accent_spans` renders each distinct string in a batch only once.
+
+Words with no accent entry of their own can be split into known words with
+`segment_accents`, which matches prefixes against a trie of the accents data.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+from util.furigana import furigana_to_kanji, furigana_to_kana
+from util.mora import mora_len, mora_substr
+from util.trie import Trie
+
+RENDER_CACHE_SIZE = 8192
+
+
+def get_accent_pos(accent_data: dict, kanji: str, kana: str) -> int | None:
+    if kanji != kana:
+        # kanji with furigana; only look up readings specific to that kanji
+        kanji_accents = accent_data.get(kanji)
+        if kanji_accents:
+            return kanji_accents.get(kana)
+    else:
+        # just kana
+        return accent_data.get(kana)
+
+
+def make_span(css_class: str, content: str) -> str:
+    return f'<span class="{css_class}">{content}</span>'
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def render_accent(kana: str, accent_pos: int) -> str:
+    """Render the pitch-accent HTML for `kana` with the given accent position."""
+    num_morae = mora_len(kana)
+    if accent_pos == 0:
+        # heiban (LHHHHH)
+        span = make_span("l-h" if num_morae > 1 else "h", mora_substr(kana, 0, 1))
+        if num_morae > 1:
+            span += make_span("h", mora_substr(kana, 1))
+    elif accent_pos == 1:
+        # atamadaka (HLLLLL)
+        span = make_span("h-l", mora_substr(kana, 0, 1))
+        if num_morae > 1:
+            span += make_span("l", mora_substr(kana, 1))
+    else:
+        # nakadaka (LHHHHL) or odaka (LHHHH)
+        span = make_span("l-h", mora_substr(kana, 0, 1))
+        span += make_span("h-l", mora_substr(kana, 1, accent_pos))
+        if accent_pos < num_morae:
+            span += make_span("l", mora_substr(kana, accent_pos))
+
+    return span
+
+
+def make_accent_span(accent_data: dict, furigana: str) -> str | None:
+    kanji = furigana_to_kanji(furigana)
+    kana = furigana_to_kana(furigana)
+    if not kana:
+        return None
+
+    accent_pos = get_accent_pos(accent_data, kanji, kana)
+    if accent_pos is None:
+        return None
+
+    return render_accent(kana, accent_pos)
+
+
+def make_accent_spans(accent_data: dict, furigana_list: list[str]) -> list[str | None]:
+    """Render accent spans for each of `furigana_list`, rendering each distinct
+    string only once."""
+    rendered = {}
+    for furigana in furigana_list:
+        if furigana not in rendered:
+            rendered[furigana] = make_accent_span(accent_data, furigana)
+    return [rendered[furigana] for furigana in furigana_list]
+
+
+@dataclass(frozen=True)
+class Segment:
+    kanji: str
+    kana: str
+    accent_pos: int
+
+    def __str__(self) -> str:
+        if self.kanji != self.kana:
+            return f"{self.kanji}[{self.kana}]={self.accent_pos}"
+        return f"{self.kana}={self.accent_pos}"
+
+
+def build_accent_trie(accent_data: dict) -> Trie:
+    """Build a trie over every kanji and kana form in `accent_data`."""
+    return Trie(accent_data.items())
+
+
+def segment_accents(trie: Trie, furigana: str) -> list[Segment] | None:
+    """Split `furigana` into the fewest words which each have a known accent,
+    matching the kanji and kana forms in step.  Returns None if no such split
+    exists."""
+    kanji = furigana_to_kanji(furigana)
+    kana = furigana_to_kana(furigana)
+    if not kana:
+        return None
+
+    # best[(i, j)] = fewest segments covering kanji[i:] and kana[j:]
+    best: dict[tuple[int, int], list[Segment] | None] = {}
+
+    def segment(i: int, j: int) -> list[Segment] | None:
+        if i == len(kanji) and j == len(kana):
+            return []
+        if (i, j) in best:
+            return best[(i, j)]
+
+        result = None
+        # try longer words first so they win ties
+        for end, value in reversed(list(trie.prefixes(kanji, i))):
+            word = kanji[i:end]
+            if isinstance(value, dict):
+                readings = value.items()
+            else:
+                # kana-only entry, so the word is its own reading
+                readings = [(word, value)]
+
+            for reading, accent_pos in readings:
+                if not kana.startswith(reading, j):
+                    continue
+                rest = segment(end, j + len(reading))
+                if rest is None:
+                    continue
+                if result is None or len(rest) + 1 < len(result):
+                    result = [Segment(word, reading, accent_pos)] + rest
+
+        best[(i, j)] = result
+        return result
+
+    return segment(0, 0)
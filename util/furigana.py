@@ -15,3 +15,10 @@ def furigana_to_kanji(furigana: str) -> str:
 
 def furigana_to_kana(furigana: str) -> str:
     return FURIGANA_RE.sub(r"\g<kana>", furigana)
+
+
+def clean_example(example: str) -> str:
+    """Normalize a Kanji note example for matching against vocab notes, dropping
+    emphasis markers and trailing な/する."""
+    example = example.strip().replace("*", "")
+    return re.sub(r"\](な|する)$", "]", example)
@@ -0,0 +1,213 @@
+"""Inverted index from kanji characters to the notes that use them.
+
+The index maps each kanji (as matched by `KANJI_RE`, plus 々) to the vocabulary
+notes and Kanji-note examples which contain it.  It is persisted as JSON along
+with each indexed note's modification time, so that refreshing it only has to
+load notes which have been added, changed or deleted since the last update.
+"""
+
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+import tempfile
+from typing import TYPE_CHECKING
+
+from util.furigana import KANJI_RE, clean_example, furigana_to_kanji
+
+if TYPE_CHECKING:
+    from anki.collection import Collection
+
+INDEX_VERSION = 1
+
+VOCAB_QUERY = '"note:Japanese vocab"'
+KANJI_QUERY = "note:Kanji"
+
+# not matched by KANJI_RE, but has a Kanji note of its own
+ITERATION_MARK = "々"
+
+
+def note_kanji(text: str) -> set[str]:
+    """Return the set of kanji characters (including 々) appearing in furigana
+    `text`."""
+    kanji = furigana_to_kanji(text)
+    found = set(KANJI_RE.findall(kanji))
+    if ITERATION_MARK in kanji:
+        found.add(ITERATION_MARK)
+    return found
+
+
+@dataclass
+class IndexedNote:
+    kind: str  # "vocab" or "kanji"
+    mod: int
+    # the Kanji field for kanji notes, the Japanese field for vocab notes
+    key: str
+    examples: list[str] = field(default_factory=list)
+
+    def entries(self) -> list[tuple[int | None, str]]:
+        """Return (example number, text) pairs to index for this note.  Vocab
+        notes have a single entry with no example number."""
+        if self.kind == "vocab":
+            return [(None, self.key)]
+        return [(n + 1, ex) for n, ex in enumerate(self.examples)]
+
+
+@dataclass
+class UpdateStats:
+    added: int = 0
+    changed: int = 0
+    removed: int = 0
+    unchanged: int = 0
+
+
+@dataclass
+class KanjiIndex:
+    notes: dict[int, IndexedNote] = field(default_factory=dict)
+    # kanji -> vocab note IDs
+    vocab: dict[str, set[int]] = field(default_factory=dict)
+    # kanji -> (kanji note ID, example number) pairs
+    examples: dict[str, set[tuple[int, int]]] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path | str) -> "KanjiIndex":
+        """Load a persisted index, or return an empty one if `path` doesn't
+        exist, is corrupt, or was written by an incompatible version."""
+        try:
+            with open(path) as index_fh:
+                data = json.load(index_fh)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return cls()
+
+        if data.get("version") != INDEX_VERSION:
+            return cls()
+
+        index = cls()
+        for note_id, note in data["notes"].items():
+            index.notes[int(note_id)] = IndexedNote(**note)
+        for kanji, note_ids in data["vocab"].items():
+            index.vocab[kanji] = set(note_ids)
+        for kanji, pairs in data["examples"].items():
+            index.examples[kanji] = set(tuple(p) for p in pairs)
+        return index
+
+    def save(self, path: Path | str) -> None:
+        data = {
+            "version": INDEX_VERSION,
+            "notes": {
+                str(note_id): note.__dict__ for note_id, note in self.notes.items()
+            },
+            "vocab": {k: sorted(ids) for k, ids in self.vocab.items()},
+            "examples": {k: sorted(pairs) for k, pairs in self.examples.items()},
+        }
+        # write to a temporary file and swap it in, so an interrupted write
+        # can't leave a truncated index behind
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w") as index_fh:
+                json.dump(data, index_fh, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def add_note(self, note_id: int, note: IndexedNote) -> None:
+        self.remove_note(note_id)
+        self.notes[note_id] = note
+        for example_id, text in note.entries():
+            for kanji in note_kanji(text):
+                if example_id is None:
+                    self.vocab.setdefault(kanji, set()).add(note_id)
+                else:
+                    self.examples.setdefault(kanji, set()).add((note_id, example_id))
+
+    def remove_note(self, note_id: int) -> None:
+        note = self.notes.pop(note_id, None)
+        if note is None:
+            return
+
+        for example_id, text in note.entries():
+            for kanji in note_kanji(text):
+                if example_id is None:
+                    entries, entry = self.vocab, note_id
+                else:
+                    entries, entry = self.examples, (note_id, example_id)
+                entries[kanji].discard(entry)
+                if not entries[kanji]:
+                    del entries[kanji]
+
+    def update(self, col: "Collection") -> UpdateStats:
+        """Bring the index in line with the current state of `col`, loading
+        only notes whose modification time differs from the indexed one."""
+        from anki.utils import ids2str
+
+        stats = UpdateStats()
+        current = {}
+        for kind, query in (("vocab", VOCAB_QUERY), ("kanji", KANJI_QUERY)):
+            note_ids = col.find_notes(query)
+            for note_id, mod in col.db.all(
+                f"select id, mod from notes where id in {ids2str(note_ids)}"
+            ):
+                current[note_id] = (kind, mod)
+
+        for note_id in set(self.notes) - set(current):
+            stats.removed += 1
+            self.remove_note(note_id)
+
+        for note_id, (kind, mod) in current.items():
+            indexed = self.notes.get(note_id)
+            if indexed and indexed.kind == kind and indexed.mod == mod:
+                stats.unchanged += 1
+                continue
+
+            if indexed:
+                stats.changed += 1
+            else:
+                stats.added += 1
+
+            note = col.get_note(note_id)
+            if kind == "vocab":
+                self.add_note(note_id, IndexedNote(kind, mod, note["Japanese"]))
+            else:
+                examples = [
+                    clean_example(ex) for ex in note["Japanese examples"].split("<br>")
+                ]
+                self.add_note(note_id, IndexedNote(kind, mod, note["Kanji"], examples))
+
+        return stats
+
+    def lookup(self, kanji: str) -> tuple[list[int], list[tuple[int, int]]]:
+        """Return the vocab note IDs and (Kanji note ID, example number) pairs
+        containing `kanji`."""
+        return (
+            sorted(self.vocab.get(kanji, ())),
+            sorted(self.examples.get(kanji, ())),
+        )
+
+    def kanji_notes(self) -> dict[str, int]:
+        """Return a mapping of each Kanji note's character to its note ID."""
+        return {
+            note.key: note_id
+            for note_id, note in self.notes.items()
+            if note.kind == "kanji"
+        }
+
+    def without_vocab(self) -> list[tuple[str, int]]:
+        """Return (kanji, note ID) for each Kanji note not used in any vocab."""
+        return sorted(
+            (kanji, note_id)
+            for kanji, note_id in self.kanji_notes().items()
+            if kanji not in self.vocab
+        )
+
+    def without_kanji_note(self) -> list[tuple[str, int]]:
+        """Return (kanji, vocab count) for each kanji used in vocab notes which
+        doesn't have its own Kanji note."""
+        kanji_notes = self.kanji_notes()
+        return sorted(
+            (kanji, len(note_ids))
+            for kanji, note_ids in self.vocab.items()
+            if kanji not in kanji_notes
+        )
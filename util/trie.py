@@ -0,0 +1,32 @@
+from typing import Any, Iterable, Iterator
+
+# marks the value stored at a node; never a valid key character since each
+# edge is exactly one character long
+_VALUE = ""
+
+
+class Trie:
+    """A character trie mapping strings to values, for finding which keys are
+    prefixes of a given string."""
+
+    def __init__(self, items: Iterable[tuple[str, Any]] = ()):
+        self.root: dict = {}
+        for key, value in items:
+            self[key] = value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        node = self.root
+        for c in key:
+            node = node.setdefault(c, {})
+        node[_VALUE] = value
+
+    def prefixes(self, text: str, start: int = 0) -> Iterator[tuple[int, Any]]:
+        """Yield (end, value) for each key equal to `text[start:end]`, shortest
+        first."""
+        node = self.root
+        for end in range(start, len(text)):
+            node = node.get(text[end])
+            if node is None:
+                return
+            if _VALUE in node:
+                yield end + 1, node[_VALUE]
@@ -4,13 +4,16 @@
 # TODO: check for missing bold in examples
 # TODO: check for empty cards
 
+import argparse
 import os
 import re
 import sys
+from typing import TYPE_CHECKING
 
-from anki.collection import Collection
+if TYPE_CHECKING:
+    from anki.collection import Collection
 
-DB_LOCATION = "~/.local/share/Anki2/Jim/collection.anki2"
+DEFAULT_DB_LOCATION = "~/.local/share/Anki2/Jim/collection.anki2"
 
 HIRAGANA_RE = re.compile(r"[\u3040-\u309F]")
 KATAKANA_RE = re.compile(r"[\u30A0-\u30FF\u31F0-\u31FF]")
@@ -18,7 +21,7 @@ KANJI_RE = re.compile(r"[\u3400-\u4DBF\u4E00-\u9FFF\uF900-\uFAFF]")
 SPACES = (" ", "&nbsp;")
 
 
-def validate_kanji(col: Collection) -> bool:
+def validate_kanji(col: "Collection") -> bool:
     # all fields: Kanji, Kun-yomi, On-yomi, Meaning, Japanese examples, English
     #             examples, Parts, Notes
     count = 0
@@ -104,7 +107,7 @@ def validate_kanji(col: Collection) -> bool:
     return errors == 0
 
 
-def validate_vocab(col: Collection) -> bool:
+def validate_vocab(col: "Collection") -> bool:
     # all fields: Japanese, English, Part of speech, Japanese examples, English
     #             examples, Notes, Kana only, Kanji only, Pitch accent
     count = 0
@@ -172,8 +175,21 @@ def validate_vocab(col: Collection) -> bool:
 
 
 if __name__ == "__main__":
-    db_file = os.path.expanduser(DB_LOCATION)
-    col = Collection(db_file)
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--anki-collection",
+        default=os.path.expanduser(DEFAULT_DB_LOCATION),
+        help="Anki collection sqlite file",
+    )
+    args = parser.parse_args()
+
+    # deferred until after argument parsing, since it's slow to import
+    from anki.collection import Collection
+
+    col = Collection(args.anki_collection)
 
     kanji_valid = validate_kanji(col)
     vocab_valid = validate_vocab(col)